@@ -0,0 +1,35 @@
+"""add_active_browse_index
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6b7c8d9e0a1
+Create Date: 2026-08-31 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, None] = 'f6b7c8d9e0a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The dominant browse query is "active orders in city+category, newest
+    # first, LIMIT n". A composite partial index is tuple-ordered for exactly
+    # that, replacing the BitmapAnd over three single-column indexes with an
+    # ordered index scan. Partial on ACTIVE keeps it tiny since most orders
+    # expire. The single-column indexes stay — owner/executor listings filter
+    # on other statuses. (CONCURRENTLY is not available inside Alembic's
+    # transactional migration.)
+    op.execute(sa.text(
+        "CREATE INDEX ix_orders_active_browse ON orders "
+        "(city, category, created_at DESC) WHERE status = 'ACTIVE'"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_active_browse', table_name='orders')
@@ -46,8 +46,10 @@ def upgrade() -> None:
 
 
 def downgrade() -> None:
+    # ix_payment_invoices_crypto_bot_invoice_id is created by a later
+    # revision (0c7e1efbbe2a) — at this level the column is covered by the
+    # inline UNIQUE constraint, so there is no index of that name to drop.
     op.drop_index('ix_payment_invoices_status', table_name='payment_invoices')
-    op.drop_index('ix_payment_invoices_crypto_bot_invoice_id', table_name='payment_invoices')
     op.drop_index('ix_payment_invoices_user_id', table_name='payment_invoices')
     op.drop_table('payment_invoices')
 
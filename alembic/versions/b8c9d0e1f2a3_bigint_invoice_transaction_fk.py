@@ -0,0 +1,35 @@
+"""bigint_invoice_transaction_fk
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-08-31 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # balance_transactions.id became bigint; keep the referencing FK the same
+    # width so joins compare int8 = int8 instead of going through a cast.
+    op.alter_column(
+        'payment_invoices', 'balance_transaction_id',
+        existing_type=sa.Integer(), type_=sa.BigInteger(),
+        existing_nullable=True,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'payment_invoices', 'balance_transaction_id',
+        existing_type=sa.BigInteger(), type_=sa.Integer(),
+        existing_nullable=True,
+    )
@@ -0,0 +1,30 @@
+"""add_active_expiry_index
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-08-31 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, None] = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The expiry sweeper scans only ACTIVE orders by created_at; a partial
+    # index keeps that scan off the (much larger) closed-order heap.
+    op.execute(sa.text(
+        "CREATE INDEX ix_orders_active_expiry ON orders (created_at) "
+        "WHERE status = 'ACTIVE'"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_active_expiry', table_name='orders')
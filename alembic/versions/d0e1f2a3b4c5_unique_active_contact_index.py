@@ -0,0 +1,31 @@
+"""unique_active_contact_index
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-08-31 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One active order per contact is enforced by the database now; the
+    # create_order pre-check SELECT is gone and the insert itself closes the
+    # race window two concurrent creates used to have.
+    op.execute(sa.text(
+        "CREATE UNIQUE INDEX ux_orders_active_contact ON orders (contact) "
+        "WHERE status = 'ACTIVE'"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_index('ux_orders_active_contact', table_name='orders')
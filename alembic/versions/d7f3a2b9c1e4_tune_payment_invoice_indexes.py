@@ -0,0 +1,39 @@
+"""tune_payment_invoice_indexes
+
+Revision ID: d7f3a2b9c1e4
+Revises: 0c7e1efbbe2a
+Create Date: 2026-08-31 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3a2b9c1e4'
+down_revision: Union[str, None] = '0c7e1efbbe2a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The dominant queries are "pending invoices for a user" and "invoice
+    # history for a user". A tiny partial index (most invoices end up
+    # PAID/EXPIRED) plus a composite history index replace the low-selectivity
+    # single-column status index, reducing per-insert write amplification.
+    op.drop_index('ix_payment_invoices_status', table_name='payment_invoices')
+    op.execute(sa.text(
+        "CREATE INDEX ix_payment_invoices_user_status "
+        "ON payment_invoices (user_id, status) WHERE status = 'PENDING'"
+    ))
+    op.execute(sa.text(
+        "CREATE INDEX ix_payment_invoices_user_created "
+        "ON payment_invoices (user_id, created_at DESC)"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_payment_invoices_user_created', table_name='payment_invoices')
+    op.drop_index('ix_payment_invoices_user_status', table_name='payment_invoices')
+    op.create_index('ix_payment_invoices_status', 'payment_invoices', ['status'], unique=False)
@@ -0,0 +1,45 @@
+"""add_orders_expires_at
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-08-31 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f2a3b4c5d6'
+down_revision: Union[str, None] = 'd0e1f2a3b4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Store the expiry moment once at creation instead of recomputing
+    # created_at + interval in every expiry check and sweeper scan.
+    op.add_column('orders', sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute(sa.text(
+        "UPDATE orders SET expires_at = "
+        "created_at + make_interval(mins => expires_in_minutes)"
+    ))
+    op.alter_column('orders', 'expires_at', nullable=False)
+
+    # The sweeper now filters on expires_at directly; replace the
+    # created_at-based partial index with one the new predicate can use.
+    op.execute(sa.text(
+        "CREATE INDEX ix_orders_active_expires_at ON orders (expires_at) "
+        "WHERE status = 'ACTIVE'"
+    ))
+    op.drop_index('ix_orders_active_expiry', table_name='orders')
+
+
+def downgrade() -> None:
+    op.execute(sa.text(
+        "CREATE INDEX ix_orders_active_expiry ON orders (created_at) "
+        "WHERE status = 'ACTIVE'"
+    ))
+    op.drop_index('ix_orders_active_expires_at', table_name='orders')
+    op.drop_column('orders', 'expires_at')
@@ -0,0 +1,39 @@
+"""add_subscription_gin_indexes
+
+Revision ID: e5a6b7c8d9f0
+Revises: d7f3a2b9c1e4
+Create Date: 2026-08-31 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a6b7c8d9f0'
+down_revision: Union[str, None] = 'd7f3a2b9c1e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Notification fan-out filters users with array @> containment on the
+    # subscription columns, which is a sequential scan without GIN. A single
+    # composite index can't mix btree and GIN access, so use one partial GIN
+    # index per array, both restricted to notifications_enabled rows since
+    # the query always requires it. (CONCURRENTLY is not available inside
+    # Alembic's transactional migration.)
+    op.execute(sa.text(
+        "CREATE INDEX ix_users_notif_categories ON users "
+        "USING GIN (subscribed_categories) WHERE notifications_enabled"
+    ))
+    op.execute(sa.text(
+        "CREATE INDEX ix_users_notif_cities ON users "
+        "USING GIN (subscribed_cities) WHERE notifications_enabled"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_notif_cities', table_name='users')
+    op.drop_index('ix_users_notif_categories', table_name='users')
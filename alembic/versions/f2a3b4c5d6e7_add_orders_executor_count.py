@@ -0,0 +1,35 @@
+"""add_orders_executor_count
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-08-31 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a3b4c5d6e7'
+down_revision: Union[str, None] = 'e1f2a3b4c5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Denormalized take count maintained by the service; lets listings and
+    # the capacity check skip joining/loading executor_takes entirely.
+    op.add_column(
+        'orders',
+        sa.Column('executor_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.execute(sa.text(
+        "UPDATE orders SET executor_count = sub.cnt "
+        "FROM (SELECT order_id, COUNT(*) AS cnt FROM executor_takes GROUP BY order_id) sub "
+        "WHERE orders.id = sub.order_id"
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column('orders', 'executor_count')
@@ -0,0 +1,45 @@
+"""bigint_payment_pks
+
+Revision ID: f6b7c8d9e0a1
+Revises: e5a6b7c8d9f0
+Create Date: 2026-08-31 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b7c8d9e0a1'
+down_revision: Union[str, None] = 'e5a6b7c8d9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Insert-heavy tables: int4 PKs exhaust at 2^31 rows, and widening now is
+    # a cheap in-place rewrite while the tables are still small.
+    op.alter_column(
+        'balance_transactions', 'id',
+        existing_type=sa.Integer(), type_=sa.BigInteger(),
+        existing_nullable=False, autoincrement=True,
+    )
+    op.alter_column(
+        'payment_invoices', 'id',
+        existing_type=sa.Integer(), type_=sa.BigInteger(),
+        existing_nullable=False, autoincrement=True,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'payment_invoices', 'id',
+        existing_type=sa.BigInteger(), type_=sa.Integer(),
+        existing_nullable=False, autoincrement=True,
+    )
+    op.alter_column(
+        'balance_transactions', 'id',
+        existing_type=sa.BigInteger(), type_=sa.Integer(),
+        existing_nullable=False, autoincrement=True,
+    )
@@ -1,7 +1,7 @@
-import json
 import logging
 
-from fastapi import APIRouter, Depends, Request
+import orjson
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -11,16 +11,26 @@ from app.schemas.balance import BalanceResponse, RechargeRequest, RechargeRespon
 from app.schemas.payment import CreateInvoiceRequest, CreateInvoiceResponse, PaymentStatusResponse
 from app.services.balance_service import BalanceService
 from app.services.crypto_payment_service import CryptoPaymentService
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/balance", tags=["Balance"])
 
+# Balance polls are the highest-frequency GET in the Mini App; cache the
+# serialized bytes keyed on (id, updated_at), which changes on any mutation.
+_balance_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60.0)
+
 
 @router.get("", response_model=BalanceResponse)
-async def get_balance(user: User = Depends(get_current_user)) -> BalanceResponse:
+async def get_balance(user: User = Depends(get_current_user)) -> Response:
     """Get current user balance"""
-    return BalanceResponse(balance=user.balance)
+    key = (user.id, user.updated_at)
+    body = _balance_cache.get(key)
+    if body is None:
+        body = orjson.dumps({"balance": user.balance})
+        _balance_cache.set(key, body)
+    return Response(body, media_type="application/json")
 
 
 @router.post("/recharge", response_model=RechargeResponse)
@@ -78,14 +88,13 @@ async def get_payment_status(
 async def crypto_bot_webhook(request: Request, db: AsyncSession = Depends(get_db)) -> dict[str, bool]:
     """Process Crypto Bot webhook (invoice_paid events)."""
     body = await request.body()
-    body_text = body.decode("utf-8")
     signature = request.headers.get("crypto-pay-api-signature", "")
 
-    if not CryptoPaymentService.verify_webhook(body_text, signature):
+    if not CryptoPaymentService.verify_webhook(body, signature):
         logger.warning("Webhook: invalid signature")
         return {"ok": False}
 
-    data = json.loads(body_text)
+    data = orjson.loads(body)
 
     update_type = data.get("update_type")
     if update_type != "invoice_paid":
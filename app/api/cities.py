@@ -1,17 +1,68 @@
-from fastapi import APIRouter, Query
+import hashlib
+import json
+from collections import defaultdict
+from functools import lru_cache
+
+from fastapi import APIRouter, Query, Request, Response
 
 from app.data.cities import RUSSIAN_CITIES
 
 router = APIRouter(prefix="/cities", tags=["Cities"])
 
+# Substring-search index built once at import time. The dataset is static,
+# so the hot path only verifies a small candidate set instead of lowercasing
+# and scanning every city on every request.
+_CITIES_LOWER: tuple[str, ...] = tuple(city.lower() for city in RUSSIAN_CITIES)
+
+
+def _build_bigram_index() -> dict[str, tuple[int, ...]]:
+    index: dict[str, set[int]] = defaultdict(set)
+    for i, low in enumerate(_CITIES_LOWER):
+        for j in range(len(low) - 1):
+            index[low[j : j + 2]].add(i)
+    return {gram: tuple(sorted(ids)) for gram, ids in index.items()}
+
+
+_BIGRAM_INDEX = _build_bigram_index()
+
+# The unfiltered response never changes — serialize it once and let clients
+# revalidate with an ETag instead of re-encoding thousands of strings per call.
+_CITIES_JSON = json.dumps(RUSSIAN_CITIES, ensure_ascii=False).encode()
+_CITIES_ETAG = f'"{hashlib.blake2b(_CITIES_JSON, digest_size=8).hexdigest()}"'
+
+
+@lru_cache(maxsize=512)
+def _search_cities(query: str) -> tuple[str, ...]:
+    """
+    Substring search over the lowercased city list via the bigram index.
+    Autocomplete traffic repeats the same short queries constantly
+    (prefix extension while typing), so results are memoized.
+    """
+    if len(query) < 2:
+        return tuple(RUSSIAN_CITIES[i] for i, low in enumerate(_CITIES_LOWER) if query in low)
+
+    candidate_lists = [_BIGRAM_INDEX.get(query[j : j + 2], ()) for j in range(len(query) - 1)]
+    if not all(candidate_lists):
+        return ()
+
+    candidates = set(min(candidate_lists, key=len))
+    for ids in candidate_lists:
+        candidates.intersection_update(ids)
+
+    return tuple(RUSSIAN_CITIES[i] for i in sorted(candidates) if query in _CITIES_LOWER[i])
+
 
 @router.get("", response_model=list[str])
 async def get_cities(
+    request: Request,
     search: str | None = Query(None, min_length=1, max_length=100, description="Search filter"),
-) -> list[str]:
+) -> Response | list[str]:
     """Return list of Russian cities, optionally filtered by search query."""
     if not search:
-        return RUSSIAN_CITIES
+        if request.headers.get("if-none-match") == _CITIES_ETAG:
+            return Response(status_code=304, headers={"ETag": _CITIES_ETAG})
+        return Response(
+            _CITIES_JSON, media_type="application/json", headers={"ETag": _CITIES_ETAG}
+        )
 
-    query = search.lower()
-    return [city for city in RUSSIAN_CITIES if query in city.lower()]
+    return list(_search_cities(search.lower()))
@@ -1,4 +1,7 @@
+from typing import Any
+
 from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -13,17 +16,74 @@ from app.schemas.order import (
     OrderResponse,
     UpdateOrderRequest,
 )
-from app.services.notification_service import notify_new_order
-from app.services.order_service import OrderService
+from app.services.notification_service import enqueue_new_order, notify_new_order
+from app.services.order_service import OrderService, orders_generation
+from app.utils.timer import wake_timer
+from app.utils.ttl_cache import TTLCache
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
-
-def _populate_review_fields(resp: OrderResponse, order: Order) -> None:
-    """Copy first review's rating/comment into the response schema."""
-    if order.reviews:
-        resp.rating = order.reviews[0].rating
-        resp.review_comment = order.reviews[0].comment
+# Public list pages repeat constantly while browsing. Keys embed the orders
+# generation (bumped on every mutation), so entries go stale-by-key the
+# moment anything changes; the TTL only bounds memory.
+_list_cache: TTLCache = TTLCache(maxsize=2_048, ttl=30.0)
+
+
+def _order_to_dict(
+    order: Order,
+    *,
+    hide_contact: bool = False,
+    skip_reviews: bool = False,
+) -> dict[str, Any]:
+    """
+    Build an OrderResponse-shaped dict without a pydantic validation pass.
+
+    Pass skip_reviews=True when Order.reviews was not eager-loaded (fresh
+    inserts, update paths) — touching it would trigger a lazy load.
+    """
+    rating = review_comment = None
+    if not skip_reviews and order.reviews:
+        rating = order.reviews[0].rating
+        review_comment = order.reviews[0].comment
+    taken_by = [
+        {"executor_id": t.executor_id, "taken_at": t.taken_at} for t in order.executor_takes
+    ]
+    return {
+        "id": order.id,
+        "category": order.category,
+        "description": order.description,
+        "city": order.city,
+        "contact": None if hide_contact else order.contact,
+        "created_at": order.created_at,
+        "expires_in_minutes": order.expires_in_minutes,
+        "status": order.status,
+        "taken_by": taken_by,
+        "executor_count": order.executor_count,
+        "customer_responded_at": order.customer_responded_at,
+        "city_locked": order.city_locked,
+        "rating": rating,
+        "review_comment": review_comment,
+    }
+
+
+def _order_row_to_dict(row: Any, rating: int | None, review_comment: str | None) -> dict[str, Any]:
+    """List-view variant of _order_to_dict for Core column rows (no ORM entity)."""
+    return {
+        "id": row.id,
+        "category": row.category,
+        "description": row.description,
+        "city": row.city,
+        "contact": None,  # always hidden in list view
+        "created_at": row.created_at,
+        "expires_in_minutes": row.expires_in_minutes,
+        "status": row.status,
+        "taken_by": [],
+        "executor_count": row.executor_count,
+        "customer_responded_at": row.customer_responded_at,
+        "city_locked": row.city_locked,
+        "rating": rating,
+        "review_comment": review_comment,
+    }
 
 
 @router.post("", response_model=OrderResponse, status_code=201)
@@ -32,11 +92,17 @@ async def create_order(
     background_tasks: BackgroundTasks,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> OrderResponse:
+) -> ORJSONResponse:
     """Create new order (FREE for clients)"""
     order = await OrderService.create_order(db, user, request)
-    background_tasks.add_task(notify_new_order, order.id, order.category, order.city, order.client_id)
-    return OrderResponse.model_validate(order)
+    wake_timer()
+    if not enqueue_new_order(order.id, order.category, order.city, order.client_id):
+        background_tasks.add_task(
+            notify_new_order, order.id, order.category, order.city, order.client_id
+        )
+    # A freshly inserted order has no reviews yet — skip touching the
+    # relationship (it isn't loaded) and serialize the dict directly.
+    return ORJSONResponse(_order_to_dict(order, skip_reviews=True), status_code=201)
 
 
 @router.get("", response_model=OrderListResponse)
@@ -50,21 +116,34 @@ async def list_orders(
     taken_by_me: bool = Query(False),
     user: User | None = Depends(get_optional_user),
     db: AsyncSession = Depends(get_db),
-) -> OrderListResponse:
+) -> ORJSONResponse:
     """List orders with filters (no auth required for browsing)"""
     client_id = user.id if mine and user else None
     executor_id = user.id if taken_by_me and user else None
-    orders, total = await OrderService.list_orders(
+
+    # Public pages (no owner/executor scoping) are identical for everyone —
+    # serve them from the cache when the data generation hasn't moved.
+    cache_key = None
+    if client_id is None and executor_id is None:
+        cache_key = (category, city, status, limit, offset, orders_generation())
+        cached = _list_cache.get(cache_key)
+        if cached is not None:
+            return ORJSONResponse(cached)
+
+    rows, total, reviews = await OrderService.list_orders(
         db, category, city, status, limit, offset, client_id=client_id, executor_id=executor_id
     )
-    # Hide contacts in list view — build response without mutating ORM objects
-    responses = []
-    for o in orders:
-        resp = OrderResponse.model_validate(o)
-        resp.contact = None
-        _populate_review_fields(resp, o)
-        responses.append(resp)
-    return OrderListResponse(orders=responses, total=total)
+    # Hide contacts in list view; emit dicts directly to skip per-row pydantic
+    # validation of trusted rows (the response shape is OrderListResponse)
+    content = {
+        "orders": [
+            _order_row_to_dict(row, *reviews.get(row.id, (None, None))) for row in rows
+        ],
+        "total": total,
+    }
+    if cache_key is not None:
+        _list_cache.set(cache_key, content)
+    return ORJSONResponse(content)
 
 
 @router.get("/{order_id}", response_model=OrderDetailResponse)
@@ -72,14 +151,10 @@ async def get_order(
     order_id: str,
     user: User | None = Depends(get_optional_user),
     db: AsyncSession = Depends(get_db),
-) -> OrderDetailResponse:
+) -> ORJSONResponse:
     """Get order details (contact visible after payment)"""
     order, show_contact = await OrderService.get_order(db, order_id, user)
-    resp = OrderDetailResponse.model_validate(order)
-    if not show_contact:
-        resp.contact = None
-    _populate_review_fields(resp, order)
-    return resp
+    return ORJSONResponse(_order_to_dict(order, hide_contact=not show_contact))
 
 
 @router.put("/{order_id}", response_model=OrderResponse)
@@ -88,10 +163,10 @@ async def update_order(
     request: UpdateOrderRequest,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> OrderResponse:
+) -> ORJSONResponse:
     """Update order (only before executor takes it, city locked)"""
     order = await OrderService.update_order(db, order_id, user, request)
-    return OrderResponse.model_validate(order)
+    return ORJSONResponse(_order_to_dict(order, skip_reviews=True))
 
 
 @router.delete("/{order_id}", status_code=204)
@@ -125,10 +200,10 @@ async def respond_to_order(
     order_id: str,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> OrderResponse:
+) -> ORJSONResponse:
     """Client confirms they responded to executor contact"""
     order = await OrderService.respond_to_order(db, order_id, user)
-    return OrderResponse.model_validate(order)
+    return ORJSONResponse(_order_to_dict(order, skip_reviews=True))
 
 
 @router.post("/{order_id}/close", status_code=204)
@@ -146,9 +221,7 @@ async def complete_order(
     order_id: str,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> OrderResponse:
+) -> ORJSONResponse:
     """Client marks order as completed"""
     order = await OrderService.complete_order(db, order_id, user)
-    resp = OrderResponse.model_validate(order)
-    _populate_review_fields(resp, order)
-    return resp
+    return ORJSONResponse(_order_to_dict(order))
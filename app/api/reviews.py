@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -57,7 +58,7 @@ async def list_reviews(
     about_me: bool = Query(False),
     user: User | None = Depends(get_optional_user),
     db: AsyncSession = Depends(get_db),
-) -> list[ReviewResponse]:
+) -> ORJSONResponse:
     """List reviews with optional rating/author/subject filter"""
     # mine=true  → reviews about me (I am the executor/subject)
     # about_me=true → reviews written by me (I am the client/author)
@@ -67,23 +68,21 @@ async def list_reviews(
         db, rating, limit, client_id=client_id, executor_id=executor_id
     )
 
-    # Transform to response format (data already eager-loaded)
-    response = []
-    for review in reviews:
-        order = review.order
-        response.append(
-            ReviewResponse(
-                id=review.id,
-                author_name=review.executor.first_name if review.executor else "Unknown",
-                rating=review.rating,
-                comment=review.comment,
-                category=order.category if order else "Unknown",
-                created_at=review.created_at,
-                order_id=review.order_id,
-                description=order.description if order else "",
-                contact=order.contact if order else None,
-                city=order.city if order else "",
-            )
-        )
+    # Rows already carry the joined order/author columns — shape dicts directly
+    response = [
+        {
+            "id": row.id,
+            "author_name": row.author_name or "Unknown",
+            "rating": row.rating,
+            "comment": row.comment,
+            "category": row.category or "Unknown",
+            "created_at": row.created_at,
+            "order_id": row.order_id,
+            "description": row.description or "",
+            "contact": row.contact,
+            "city": row.city or "",
+        }
+        for row in reviews
+    ]
 
-    return response
+    return ORJSONResponse(response)
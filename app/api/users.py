@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.middleware.auth import get_current_user
+from app.middleware.auth import get_current_user, get_current_user_id
 from app.models.user import User
 from app.schemas.user import (
     NotificationSettingsResponse,
@@ -11,25 +13,38 @@ from app.schemas.user import (
     UpdatePreferencesRequest,
     UserProfileResponse,
 )
+from app.utils.ttl_cache import TTLCache
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Serialized profile bytes keyed on (id, updated_at) — Mini App clients poll
+# this endpoint constantly, and updated_at changes on every user mutation, so
+# a stale entry simply misses. The short TTL bounds memory, not correctness.
+_profile_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60.0)
+
 
 @router.get("/me", response_model=UserProfileResponse)
 async def get_current_user_profile(
     user: User = Depends(get_current_user),
-) -> UserProfileResponse:
+) -> Response:
     """Get current user profile"""
-    return UserProfileResponse(
-        id=user.id,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        username=user.username,
-        completed_orders=user.completed_orders_count,
-        active_orders=user.active_orders_count,
-        rating=user.average_rating,
-        balance=user.balance,
-    )
+    key = (user.id, user.updated_at)
+    body = _profile_cache.get(key)
+    if body is None:
+        body = orjson.dumps(
+            {
+                "id": user.id,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "username": user.username,
+                "completed_orders": user.completed_orders_count,
+                "active_orders": user.active_orders_count,
+                "rating": user.average_rating,
+                "balance": user.balance,
+            }
+        )
+        _profile_cache.set(key, body)
+    return Response(body, media_type="application/json")
 
 
 @router.get("/me/notification-settings", response_model=NotificationSettingsResponse)
@@ -60,9 +75,40 @@ async def update_preferences(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, bool]:
-    """Update notification preferences (categories & cities)"""
-    user.subscribed_categories = request.categories
-    user.subscribed_cities = request.cities
+    """
+    Update notification preferences (categories & cities).
+    Accepts full lists (replace) and/or add_/remove_ deltas; deltas are
+    merged in SQL so the array columns are only rewritten when changed.
+    """
+    values = {}
+    if request.categories is not None:
+        values["subscribed_categories"] = request.categories
+    if request.cities is not None:
+        values["subscribed_cities"] = request.cities
+    if values:
+        await db.execute(update(User).where(User.id == user.id).values(**values))
+
+    for column, to_add, to_remove in (
+        ("subscribed_categories", request.add_categories, request.remove_categories),
+        ("subscribed_cities", request.add_cities, request.remove_cities),
+    ):
+        if not to_add and not to_remove:
+            continue
+        await db.execute(
+            text(
+                f"""
+                UPDATE users
+                SET {column} = (
+                    SELECT coalesce(array_agg(DISTINCT x), '{{}}')
+                    FROM unnest({column} || CAST(:to_add AS varchar[])) AS x
+                    WHERE x <> ALL(CAST(:to_remove AS varchar[]))
+                )
+                WHERE id = :user_id
+                """
+            ),
+            {"to_add": to_add, "to_remove": to_remove, "user_id": user.id},
+        )
+
     await db.commit()
     return {"success": True}
 
@@ -70,13 +116,22 @@ async def update_preferences(
 @router.put("/me/notification-settings", status_code=200)
 async def update_notification_settings(
     request: UpdateNotificationSettingsRequest,
-    user: User = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ) -> dict[str, bool]:
     """Update notification settings (enabled flag and/or frequency)"""
+    values = {}
     if request.enabled is not None:
-        user.notifications_enabled = request.enabled
+        values["notifications_enabled"] = request.enabled
     if request.frequency is not None:
-        user.notification_frequency_minutes = request.frequency
-    await db.commit()
+        values["notification_frequency_minutes"] = request.frequency
+
+    if values:
+        result = await db.execute(update(User).where(User.id == user_id).values(**values))
+        if result.rowcount == 0:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+        await db.commit()
+
     return {"success": True}
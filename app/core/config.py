@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -33,7 +35,7 @@ class Settings(BaseSettings):
     max_executors_per_order: int = 3
     order_take_cost: int = 2  # rubles
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
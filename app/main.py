@@ -1,11 +1,12 @@
 import asyncio
 import logging
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy import text
 
 from app.api import balance, cities, orders, reviews, users
@@ -19,20 +20,41 @@ from app.models import (  # noqa
     PaymentInvoice,
     User,
 )
-from app.utils.timer import auto_close_expired_orders
+from app.services.crypto_payment_service import close_crypto_client, init_crypto_client
+from app.services.notification_service import (
+    start_notification_workers,
+    stop_notification_workers,
+)
+from app.utils.clock import request_now_var
+from app.utils.timer import auto_close_expired_orders, next_order_deadline, timer_wakeup
 
 logger = logging.getLogger(__name__)
 
 
 async def _timer_loop() -> None:
-    """Background loop that auto-closes expired orders every 60 seconds."""
+    """
+    Background loop that auto-closes expired orders.
+    Sleeps until the next known order deadline (capped at 60s) instead of
+    polling on a fixed interval, and wakes early when an order is created.
+    """
     while True:
+        deadline = None
         try:
+            await auto_close_expired_orders()
             async with async_session_maker() as db:
-                await auto_close_expired_orders(db)
+                deadline = await next_order_deadline(db)
         except Exception:
             logger.exception("Timer loop error")
-        await asyncio.sleep(60)
+
+        delay = 60.0
+        if deadline is not None:
+            delay = max(1.0, min(60.0, (deadline - datetime.now(timezone.utc)).total_seconds()))
+
+        timer_wakeup.clear()
+        try:
+            await asyncio.wait_for(timer_wakeup.wait(), timeout=delay)
+        except TimeoutError:
+            pass
 
 
 @asynccontextmanager
@@ -47,10 +69,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     logger.info("Timer: %d minutes per order", settings.order_lifetime_minutes)
     logger.info("Cost: %d₽ per order access", settings.order_take_cost)
 
+    init_crypto_client()
+    start_notification_workers()
     timer_task = asyncio.create_task(_timer_loop())
 
     yield
 
+    await stop_notification_workers()
+    await close_crypto_client()
     timer_task.cancel()
     try:
         await timer_task
@@ -65,8 +91,16 @@ app = FastAPI(
     description="FastAPI backend for Telegram WebApp urgent services marketplace",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+@app.middleware("http")
+async def freeze_request_clock(request: Request, call_next: Callable) -> Response:
+    """Read the clock once per request; model defaults share the timestamp."""
+    request_now_var.set(datetime.now(timezone.utc))
+    return await call_next(request)
+
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
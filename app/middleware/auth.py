@@ -2,66 +2,153 @@ import hashlib
 import hmac
 import json
 from typing import Any
-from urllib.parse import parse_qs
+from urllib.parse import unquote_plus
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
+from app.utils.ttl_cache import TTLCache
 
 security = HTTPBearer()
 
+# Shared instance for optional auth — instantiating HTTPBearer inside a
+# parameter default would rebuild the dependency on every request.
+optional_security = HTTPBearer(auto_error=False)
 
-def validate_telegram_init_data(init_data: str, bot_token: str) -> dict[str, Any]:
+# The secret key only depends on the bot token, which is immutable for the
+# process lifetime — derive it once instead of one extra HMAC per request.
+_SECRET_KEY = hmac.new(
+    b"WebAppData", settings.telegram_bot_token.encode(), hashlib.sha256
+).digest()
+
+# Telegram WebApps reuse the same initData for the whole session, so the
+# HMAC check result can be cached briefly — repeat requests skip the
+# parse + HMAC entirely and go straight to the user lookup.
+_init_data_cache = TTLCache(maxsize=50_000, ttl=60.0)
+
+
+def _parse_init_data(init_data: str) -> tuple[str, str | None, str]:
+    """
+    Single-pass parse of the initData query string.
+    Returns (data_check_string, received_hash, user_json) without building
+    the intermediate dict-of-lists that parse_qs would allocate.
+    """
+    pairs: list[tuple[str, str]] = []
+    received_hash: str | None = None
+    user_json = "{}"
+
+    for field in init_data.split("&"):
+        key, sep, value = field.partition("=")
+        if not sep:
+            continue
+        value = unquote_plus(value)
+        if key == "hash":
+            received_hash = value
+            continue
+        if key == "user":
+            user_json = value
+        pairs.append((key, value))
+
+    pairs.sort()
+    return "\n".join(f"{key}={value}" for key, value in pairs), received_hash, user_json
+
+
+def _validate_init_data(init_data: str) -> dict[str, Any] | None:
     """
     Validates Telegram WebApp initData according to official docs:
     https://core.telegram.org/bots/webapps#validating-data-received-via-the-mini-app
+
+    Returns the parsed user payload, or None when validation fails —
+    callers decide whether a failure is an error (exceptions are too
+    expensive for the optional-auth browse path).
     """
+    cache_key = hashlib.blake2b(init_data.encode(), digest_size=16).digest()
+    cached: dict[str, Any] | None = _init_data_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        parsed = parse_qs(init_data)
+        data_check_string, received_hash, user_json = _parse_init_data(init_data)
 
-        # Extract hash from initData
-        received_hash = parsed.get("hash", [None])[0]
         if not received_hash:
-            raise ValueError("Missing hash in initData")
-
-        # Remove hash from data for validation
-        data_check_arr = []
-        for key, values in sorted(parsed.items()):
-            if key != "hash":
-                data_check_arr.append(f"{key}={values[0]}")
-
-        data_check_string = "\n".join(data_check_arr)
-
-        # Generate secret key
-        secret_key = hmac.new(
-            "WebAppData".encode(), bot_token.encode(), hashlib.sha256
-        ).digest()
+            return None
 
-        # Calculate hash
-        calculated_hash = hmac.new(
-            secret_key, data_check_string.encode(), hashlib.sha256
-        ).hexdigest()
+        # One-shot C fast path — no HMAC object construction, raw-bytes compare
+        calculated_hash = hmac.digest(_SECRET_KEY, data_check_string.encode(), "sha256")
 
-        if calculated_hash != received_hash:
-            raise ValueError("Invalid hash - data integrity check failed")
+        if not hmac.compare_digest(calculated_hash, bytes.fromhex(received_hash)):
+            return None
 
-        # Parse user data
-        user_data: dict[str, Any] = json.loads(parsed.get("user", ["{}"])[0])
+        user_data: dict[str, Any] = json.loads(user_json)
         if not user_data:
-            raise ValueError("Missing user data in initData")
+            return None
+    except Exception:
+        return None
 
-        return user_data
+    _init_data_cache.set(cache_key, user_data)
+    return user_data
 
-    except Exception as e:
+
+def validate_telegram_init_data(init_data: str) -> dict[str, Any]:
+    """Validate initData, raising 401 on failure. See _validate_init_data."""
+    user_data = _validate_init_data(init_data)
+    if user_data is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid Telegram initData: {str(e)}",
-        ) from e
+            detail="Invalid Telegram initData",
+        )
+    return user_data
+
+
+async def _try_get_user(
+    credentials: HTTPAuthorizationCredentials, db: AsyncSession
+) -> User | None:
+    """Authenticate and return-or-create the user; None if initData is invalid."""
+    user_data = _validate_init_data(credentials.credentials)
+    if user_data is None:
+        return None
+
+    telegram_id = user_data.get("id")
+    if not telegram_id:
+        return None
+
+    # Get or create user
+    result = await db.execute(select(User).where(User.id == telegram_id))
+    user = result.scalar_one_or_none()
+
+    if not user:
+        # Single INSERT ... ON CONFLICT ... RETURNING round-trip: covers both
+        # first contact and the race where a concurrent request created the
+        # row, and returns the populated row without a follow-up SELECT.
+        stmt = (
+            pg_insert(User)
+            .values(
+                id=telegram_id,
+                username=user_data.get("username"),
+                first_name=user_data.get("first_name", ""),
+                last_name=user_data.get("last_name"),
+                language_code=user_data.get("language_code"),
+            )
+            .on_conflict_do_update(
+                index_elements=[User.id],
+                set_={
+                    "username": user_data.get("username"),
+                    "first_name": user_data.get("first_name", ""),
+                    "last_name": user_data.get("last_name"),
+                },
+            )
+            .returning(User)
+        )
+        user = (await db.execute(stmt)).scalar_one()
+        await db.commit()
+
+    return user
 
 
 async def get_current_user(
@@ -72,10 +159,23 @@ async def get_current_user(
     Validates Telegram WebApp initData and returns or creates user.
     Token format: Bearer <initData>
     """
-    init_data = credentials.credentials
+    user = await _try_get_user(credentials, db)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid Telegram initData",
+        )
+    return user
+
 
-    # Validate initData with bot token
-    user_data = validate_telegram_init_data(init_data, settings.telegram_bot_token)
+async def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> int:
+    """
+    Lightweight dependency for write-only endpoints: validates initData and
+    returns the Telegram user id without loading the User row.
+    """
+    user_data = validate_telegram_init_data(credentials.credentials)
 
     telegram_id = user_data.get("id")
     if not telegram_id:
@@ -84,35 +184,14 @@ async def get_current_user(
             detail="Invalid user ID in initData",
         )
 
-    # Get or create user
-    result = await db.execute(select(User).where(User.id == telegram_id))
-    user = result.scalar_one_or_none()
-
-    if not user:
-        user = User(
-            id=telegram_id,
-            username=user_data.get("username"),
-            first_name=user_data.get("first_name", ""),
-            last_name=user_data.get("last_name"),
-            language_code=user_data.get("language_code"),
-        )
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
-
-    return user
+    return int(telegram_id)
 
 
 async def get_optional_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(HTTPBearer(auto_error=False)),
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
     db: AsyncSession = Depends(get_db),
 ) -> User | None:
     """Optional authentication - returns None if no valid token"""
     if not credentials:
         return None
-    try:
-        return await get_current_user(credentials, db)
-    except HTTPException as e:
-        if e.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN):
-            return None
-        raise
+    return await _try_get_user(credentials, db)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
@@ -9,6 +9,7 @@ from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -23,7 +24,7 @@ class TransactionType(str, Enum):
 class BalanceTransaction(Base):
     __tablename__ = "balance_transactions"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.id"), index=True)
 
     type: Mapped[TransactionType] = mapped_column(SQLEnum(TransactionType), index=True)
@@ -36,7 +37,7 @@ class BalanceTransaction(Base):
 
     description: Mapped[str | None] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+        DateTime(timezone=True), default=utcnow, index=True
     )
 
     # Relationships
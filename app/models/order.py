@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
@@ -18,6 +18,7 @@ from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.review import ClientReview, ExecutorComplaint
@@ -46,12 +47,19 @@ class Order(Base):
     status: Mapped[OrderStatus] = mapped_column(SQLEnum(OrderStatus), default=OrderStatus.ACTIVE, index=True)
     city_locked: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Denormalized count of executor_takes, maintained by take_order; lets
+    # listings and the capacity check avoid loading the collection.
+    executor_count: Mapped[int] = mapped_column(Integer, default=0)
+
     expires_in_minutes: Mapped[int] = mapped_column(Integer, default=60)
+    # Precomputed at creation so expiry checks (Python and SQL) compare a
+    # stored value instead of recomputing created_at + interval per row.
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+        DateTime(timezone=True), default=utcnow, index=True
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), default=utcnow, onupdate=utcnow
     )
 
     # When customer responds after executor contact
@@ -59,8 +67,10 @@ class Order(Base):
 
     # Relationships
     client: Mapped["User"] = relationship("User", back_populates="orders_created", foreign_keys=[client_id])
+    # lazy="raise" turns any accidental lazy load (an N+1 in disguise) into a
+    # loud error — every reader must eager-load via selectinload or refresh.
     executor_takes: Mapped[list["ExecutorTake"]] = relationship(
-        "ExecutorTake", back_populates="order", cascade="all, delete-orphan"
+        "ExecutorTake", back_populates="order", cascade="all, delete-orphan", lazy="raise"
     )
     reviews: Mapped[list["ClientReview"]] = relationship(back_populates="order")
     complaints: Mapped[list["ExecutorComplaint"]] = relationship(back_populates="order")
@@ -75,7 +85,7 @@ class ExecutorTake(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     order_id: Mapped[str] = mapped_column(String(32), ForeignKey("orders.id"), index=True)
     executor_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.id"), index=True)
-    taken_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    taken_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
 
     # Relationships
     order: Mapped["Order"] = relationship("Order", back_populates="executor_takes")
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
@@ -9,6 +9,7 @@ from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.balance import BalanceTransaction
@@ -24,25 +25,27 @@ class InvoiceStatus(str, Enum):
 class PaymentInvoice(Base):
     __tablename__ = "payment_invoices"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("users.id"), index=True)
 
     crypto_bot_invoice_id: Mapped[int] = mapped_column(Integer, unique=True, index=True)
     amount: Mapped[int] = mapped_column(Integer)  # RUB
+    # No plain status index: migration d7f3a2b9c1e4 replaced it with a
+    # partial index, and autogenerate must not recreate the dropped one.
     status: Mapped[InvoiceStatus] = mapped_column(
-        SQLEnum(InvoiceStatus), default=InvoiceStatus.PENDING, index=True
+        SQLEnum(InvoiceStatus), default=InvoiceStatus.PENDING
     )
 
     pay_url: Mapped[str | None] = mapped_column(String(512))
     mini_app_invoice_url: Mapped[str | None] = mapped_column(String(512))
 
     balance_transaction_id: Mapped[int | None] = mapped_column(
-        Integer, ForeignKey("balance_transactions.id")
+        BigInteger, ForeignKey("balance_transactions.id")
     )
 
     paid_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), default=utcnow
     )
 
     # Relationships
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime
 from enum import Enum
 from typing import TYPE_CHECKING
 
@@ -9,6 +9,7 @@ from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.order import Order
@@ -16,11 +17,22 @@ if TYPE_CHECKING:
 
 
 class ComplaintReason(str, Enum):
-    NO_RESPONSE = "Не отвечал"
-    CANCELLED_ORDER = "Отменил заказ"
-    INADEQUATE_BEHAVIOR = "Неадекватное поведение"
-    FALSE_INFO = "Ложная информация"
-    OTHER = "Другое"
+    NO_RESPONSE = "no_response"
+    CANCELLED_ORDER = "cancelled_order"
+    INADEQUATE_BEHAVIOR = "inadequate_behavior"
+    FALSE_INFO = "false_info"
+    OTHER = "other"
+
+
+# User-facing Russian labels live here, not in the enum values, so the wire
+# format and DB stay compact ASCII codes.
+COMPLAINT_REASON_LABELS: dict[ComplaintReason, str] = {
+    ComplaintReason.NO_RESPONSE: "Не отвечал",
+    ComplaintReason.CANCELLED_ORDER: "Отменил заказ",
+    ComplaintReason.INADEQUATE_BEHAVIOR: "Неадекватное поведение",
+    ComplaintReason.FALSE_INFO: "Ложная информация",
+    ComplaintReason.OTHER: "Другое",
+}
 
 
 class ClientReview(Base):
@@ -38,7 +50,7 @@ class ClientReview(Base):
     comment: Mapped[str | None] = mapped_column(Text)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+        DateTime(timezone=True), default=utcnow, index=True
     )
 
     # Relationships
@@ -62,7 +74,7 @@ class ExecutorComplaint(Base):
     comment: Mapped[str | None] = mapped_column(Text)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+        DateTime(timezone=True), default=utcnow, index=True
     )
 
     # Relationships
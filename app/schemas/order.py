@@ -1,11 +1,14 @@
 from datetime import datetime
+from typing import Literal, get_args
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
 
 from app.models.order import OrderStatus
 
-# Valid Russian service categories
-VALID_CATEGORIES = [
+# Valid Russian service categories. Declared as a Literal so pydantic-core
+# validates membership with a precomputed lookup in Rust instead of a Python
+# field_validator doing a linear list scan.
+CategoryLiteral = Literal[
     "Сантехника",
     "Электрика",
     "Бытовой ремонт",
@@ -15,35 +18,23 @@ VALID_CATEGORIES = [
     "Другое",
 ]
 
+VALID_CATEGORIES = list(get_args(CategoryLiteral))
+
 
 class CreateOrderRequest(BaseModel):
-    category: str = Field(description="Service category")
+    category: CategoryLiteral = Field(description="Service category")
     description: str = Field(min_length=20, max_length=1000, description="Order description")
     city: str = Field(min_length=2, max_length=100, description="Russian city name")
     contact: str = Field(
         min_length=3, max_length=100, description="Telegram @username or Russian phone"
     )
 
-    @field_validator("category")
-    @classmethod
-    def validate_category(cls, v: str) -> str:
-        if v not in VALID_CATEGORIES:
-            raise ValueError(f"Category must be one of: {', '.join(VALID_CATEGORIES)}")
-        return v
-
 
 class UpdateOrderRequest(BaseModel):
-    category: str | None = None
+    category: CategoryLiteral | None = None
     description: str | None = Field(None, min_length=20, max_length=1000)
     contact: str | None = Field(None, min_length=3, max_length=100)
 
-    @field_validator("category")
-    @classmethod
-    def validate_category(cls, v: str | None) -> str | None:
-        if v is not None and v not in VALID_CATEGORIES:
-            raise ValueError(f"Category must be one of: {', '.join(VALID_CATEGORIES)}")
-        return v
-
 
 class ExecutorTakeSchema(BaseModel):
     executor_id: int
@@ -63,6 +54,7 @@ class OrderResponse(BaseModel):
     expires_in_minutes: int
     status: OrderStatus
     taken_by: list[ExecutorTakeSchema] = Field(default_factory=list, validation_alias="executor_takes")
+    executor_count: int = 0  # aggregated in list views where taken_by is omitted
     customer_responded_at: datetime | None = Field(None, validation_alias="customer_responded_at")
     city_locked: bool
     rating: int | None = None
@@ -28,8 +28,14 @@ class UserProfileResponse(BaseModel):
 
 
 class UpdatePreferencesRequest(BaseModel):
-    categories: list[str] = Field(default_factory=list, max_length=10)
-    cities: list[str] = Field(default_factory=list, max_length=20)
+    # Full-replace lists (legacy behaviour) — omit to leave untouched
+    categories: list[str] | None = Field(None, max_length=10)
+    cities: list[str] | None = Field(None, max_length=20)
+    # Delta lists — applied in SQL without rewriting untouched entries
+    add_categories: list[str] = Field(default_factory=list, max_length=10)
+    remove_categories: list[str] = Field(default_factory=list, max_length=10)
+    add_cities: list[str] = Field(default_factory=list, max_length=20)
+    remove_cities: list[str] = Field(default_factory=list, max_length=20)
 
 
 class UpdateNotificationSettingsRequest(BaseModel):
@@ -1,11 +1,22 @@
+from datetime import datetime, timezone
+from typing import Any
+
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import bindparam, insert, lambda_stmt, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.balance import BalanceTransaction, TransactionType
 from app.models.user import User
 
 
+def _locked_user_stmt():
+    # lambda_stmt caches the compiled SQL keyed on the lambda's code object,
+    # skipping statement construction/compilation on this hot path.
+    return lambda_stmt(
+        lambda: select(User).where(User.id == bindparam("uid")).with_for_update()
+    )
+
+
 class BalanceService:
     @staticmethod
     async def recharge_balance(
@@ -24,9 +35,7 @@ class BalanceService:
         # For now, directly add to balance (DEV MODE)
 
         # Lock user row to prevent concurrent balance races
-        result = await db.execute(
-            select(User).where(User.id == user.id).with_for_update()
-        )
+        result = await db.execute(_locked_user_stmt(), {"uid": user.id})
         user = result.scalar_one()
 
         user.balance += amount
@@ -61,3 +70,67 @@ class BalanceService:
             description=f"Refund for order {order_id}",
         )
         db.add(transaction)
+
+    @staticmethod
+    async def bulk_create_transactions(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        """
+        Insert many BalanceTransaction rows in one multi-row statement —
+        much cheaper than per-object db.add() when batches are large
+        (e.g. the expiry sweeper refunding many executors at once).
+        """
+        if not rows:
+            return
+        await db.execute(insert(BalanceTransaction), rows)
+
+    _COPY_COLUMNS = (
+        "user_id",
+        "type",
+        "amount",
+        "balance_after",
+        "order_id",
+        "payment_method",
+        "external_transaction_id",
+        "description",
+        "created_at",
+    )
+
+    @staticmethod
+    async def bulk_copy_transactions(
+        db: AsyncSession, rows: list[dict[str, Any]]
+    ) -> int:
+        """
+        Bulk-load BalanceTransaction rows via Postgres COPY — for maintenance
+        backfills (webhook reconciliation, legacy imports), not request
+        traffic. COPY skips per-row INSERT parsing and is an order of
+        magnitude faster on thousands of rows; synchronous_commit is relaxed
+        for the transaction since a crashed backfill is simply re-run.
+        Missing keys are sent as NULL / column defaults. Returns row count.
+        """
+        if not rows:
+            return 0
+
+        def _raw(col: str, row: dict[str, Any]) -> Any:
+            if col == "created_at":
+                return row.get("created_at", now)
+            value = row.get(col)
+            # COPY bypasses SQLAlchemy's enum adaptation — the DB enum labels
+            # are the member names, so send those.
+            if col == "type" and isinstance(value, TransactionType):
+                return value.name
+            return value
+
+        now = datetime.now(timezone.utc)
+        records = [
+            tuple(_raw(col, row) for col in BalanceService._COPY_COLUMNS) for row in rows
+        ]
+
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        await db.execute(text("SET LOCAL synchronous_commit = off"))
+        await raw.driver_connection.copy_records_to_table(
+            "balance_transactions",
+            records=records,
+            columns=BalanceService._COPY_COLUMNS,
+        )
+        await db.commit()
+        return len(records)
@@ -1,11 +1,11 @@
 import logging
 from datetime import datetime, timezone
 from hashlib import sha256
-from hmac import HMAC
+from hmac import HMAC, compare_digest
 
 from aiocryptopay import AioCryptoPay, Networks
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import bindparam, lambda_stmt, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -15,6 +15,14 @@ from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
+# The webhook signature key is SHA-256 of the API token; the token is fixed
+# for the process lifetime, so hash it once at import instead of per webhook.
+_TOKEN_HASH: bytes | None = (
+    sha256(settings.crypto_bot_api_token.encode("UTF-8")).digest()
+    if settings.crypto_bot_api_token
+    else None
+)
+
 
 def _get_network() -> str:
     if settings.crypto_bot_network in ("main", "mainnet"):
@@ -22,6 +30,42 @@ def _get_network() -> str:
     return str(Networks.TEST_NET)
 
 
+# Process-wide Crypto Bot client. Creating one per call paid a fresh TCP +
+# TLS handshake per invoice; a single client reuses pooled connections.
+_crypto_client: AioCryptoPay | None = None
+
+
+def init_crypto_client() -> None:
+    """Create the shared Crypto Bot client. Called from the app lifespan."""
+    global _crypto_client
+    if settings.crypto_bot_api_token:
+        _crypto_client = AioCryptoPay(
+            token=settings.crypto_bot_api_token,
+            network=_get_network(),
+        )
+
+
+async def close_crypto_client() -> None:
+    """Close the shared client's session. Called from the app lifespan."""
+    global _crypto_client
+    if _crypto_client is not None:
+        await _crypto_client.close()
+        _crypto_client = None
+
+
+def _get_crypto_client() -> AioCryptoPay:
+    # Lazy fallback keeps scripts and tests working outside the app lifespan.
+    global _crypto_client
+    if _crypto_client is None:
+        init_crypto_client()
+    if _crypto_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Payment service not configured",
+        )
+    return _crypto_client
+
+
 class CryptoPaymentService:
     @staticmethod
     async def create_invoice(db: AsyncSession, user: User, amount: int) -> PaymentInvoice:
@@ -31,23 +75,14 @@ class CryptoPaymentService:
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Amount must be positive"
             )
 
-        if not settings.crypto_bot_api_token:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Payment service not configured",
-            )
-
-        async with AioCryptoPay(
-            token=settings.crypto_bot_api_token,
-            network=_get_network(),
-        ) as client:
-            invoice = await client.create_invoice(
-                currency_type="fiat",
-                fiat="RUB",
-                amount=amount,
-                description=f"Пополнение баланса на {amount}₽",
-                expires_in=1800,  # 30 minutes
-            )
+        client = _get_crypto_client()
+        invoice = await client.create_invoice(
+            currency_type="fiat",
+            fiat="RUB",
+            amount=amount,
+            description=f"Пополнение баланса на {amount}₽",
+            expires_in=1800,  # 30 minutes
+        )
 
         payment = PaymentInvoice(
             user_id=user.id,
@@ -70,38 +105,43 @@ class CryptoPaymentService:
     @staticmethod
     async def process_paid_invoice(db: AsyncSession, crypto_bot_invoice_id: int) -> None:
         """Process a paid invoice from Crypto Bot webhook. Idempotent."""
-        # Find invoice
+        # Atomically flip PENDING → PAID; zero rows returned means the invoice
+        # is unknown or already processed — the conditional UPDATE is both the
+        # idempotency check and the lock, with no FOR UPDATE round-trips.
         result = await db.execute(
-            select(PaymentInvoice)
-            .where(PaymentInvoice.crypto_bot_invoice_id == crypto_bot_invoice_id)
-            .with_for_update()
+            update(PaymentInvoice)
+            .where(
+                PaymentInvoice.crypto_bot_invoice_id == crypto_bot_invoice_id,
+                PaymentInvoice.status == InvoiceStatus.PENDING,
+            )
+            .values(status=InvoiceStatus.PAID, paid_at=datetime.now(timezone.utc))
+            .returning(PaymentInvoice.id, PaymentInvoice.user_id, PaymentInvoice.amount)
         )
-        invoice = result.scalar_one_or_none()
-
-        if not invoice:
-            logger.warning("Webhook: invoice not found for crypto_bot_id=%d", crypto_bot_invoice_id)
-            return
+        invoice = result.one_or_none()
 
-        # Idempotency: skip if already paid
-        if invoice.status == InvoiceStatus.PAID:
-            logger.info("Webhook: invoice #%d already paid, skipping", invoice.id)
+        if invoice is None:
+            logger.info(
+                "Webhook: no pending invoice for crypto_bot_id=%d (unknown or duplicate)",
+                crypto_bot_invoice_id,
+            )
             return
 
-        # Lock user row
-        user_result = await db.execute(
-            select(User).where(User.id == invoice.user_id).with_for_update()
-        )
-        user = user_result.scalar_one()
-
-        # Credit balance
-        user.balance += invoice.amount
+        # Credit balance atomically — the UPDATE serializes concurrent credits
+        new_balance = (
+            await db.execute(
+                update(User)
+                .where(User.id == invoice.user_id)
+                .values(balance=User.balance + invoice.amount)
+                .returning(User.balance)
+            )
+        ).scalar_one()
 
-        # Create balance transaction
+        # Create balance transaction and link it to the invoice
         transaction = BalanceTransaction(
-            user_id=user.id,
+            user_id=invoice.user_id,
             type=TransactionType.RECHARGE,
             amount=invoice.amount,
-            balance_after=user.balance,
+            balance_after=new_balance,
             payment_method="crypto_bot",
             external_transaction_id=str(crypto_bot_invoice_id),
             description=f"Crypto Bot payment #{crypto_bot_invoice_id}",
@@ -109,40 +149,41 @@ class CryptoPaymentService:
         db.add(transaction)
         await db.flush()
 
-        # Update invoice
-        invoice.status = InvoiceStatus.PAID
-        invoice.balance_transaction_id = transaction.id
-        invoice.paid_at = datetime.now(timezone.utc)
+        await db.execute(
+            update(PaymentInvoice)
+            .where(PaymentInvoice.id == invoice.id)
+            .values(balance_transaction_id=transaction.id)
+        )
 
         await db.commit()
         logger.info(
             "Invoice #%d paid: user=%d, amount=%d, new_balance=%d",
-            invoice.id, user.id, invoice.amount, user.balance,
+            invoice.id, invoice.user_id, invoice.amount, new_balance,
         )
 
     @staticmethod
-    def verify_webhook(body: str, signature: str) -> bool:
-        """Verify Crypto Bot webhook signature using HMAC-SHA256."""
-        if not settings.crypto_bot_api_token:
+    def verify_webhook(body: bytes, signature: str) -> bool:
+        """Verify Crypto Bot webhook signature using HMAC-SHA256 over the raw body."""
+        if _TOKEN_HASH is None:
             return False
 
-        token_hash = sha256(settings.crypto_bot_api_token.encode("UTF-8")).digest()
-        expected = HMAC(
-            key=token_hash, msg=body.encode("UTF-8"), digestmod=sha256
-        ).hexdigest()
-        return expected == signature
+        expected = HMAC(key=_TOKEN_HASH, msg=body, digestmod=sha256).hexdigest()
+        return compare_digest(expected, signature)
 
     @staticmethod
     async def get_invoice_status(
         db: AsyncSession, payment_id: int, user_id: int
     ) -> PaymentInvoice:
         """Get invoice status, scoped to user for security."""
-        result = await db.execute(
-            select(PaymentInvoice).where(
-                PaymentInvoice.id == payment_id,
-                PaymentInvoice.user_id == user_id,
+        # lambda_stmt skips rebuilding/recompiling this select on every poll —
+        # status polling is the hottest read in the payment flow.
+        stmt = lambda_stmt(
+            lambda: select(PaymentInvoice).where(
+                PaymentInvoice.id == bindparam("payment_id"),
+                PaymentInvoice.user_id == bindparam("user_id"),
             )
         )
+        result = await db.execute(stmt, {"payment_id": payment_id, "user_id": user_id})
         invoice = result.scalar_one_or_none()
         if not invoice:
             raise HTTPException(
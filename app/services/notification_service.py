@@ -1,8 +1,9 @@
+import asyncio
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
 import httpx
-from sqlalchemy import select
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -11,6 +12,88 @@ from app.models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Bounded in-process queue drained by dedicated workers, so the request
+# path only pays an O(1) put_nowait instead of holding the worker for the
+# whole Telegram fan-out (as BackgroundTasks would).
+_NOTIFY_QUEUE_SIZE = 10_000
+_NOTIFY_WORKER_COUNT = 4
+
+# Max in-flight Telegram API requests per fan-out
+_SEND_CONCURRENCY = 20
+
+# Shared pooled client for Telegram sends, created by the app lifespan (and
+# recreated on each cycle). Keep-alive connections avoid a TCP + TLS handshake
+# per fan-out, and the tight timeouts stop one stuck response from pinning a
+# worker slot for 10 seconds.
+_notify_client: httpx.AsyncClient | None = None
+
+_notify_queue: asyncio.Queue[tuple[str, str, str, int]] | None = None
+_worker_tasks: list[asyncio.Task[None]] = []
+
+
+def _get_notify_client() -> httpx.AsyncClient:
+    # Lazy fallback keeps the BackgroundTasks path working outside the
+    # lifespan (scripts, tests).
+    global _notify_client
+    if _notify_client is None:
+        _notify_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(connect=2.0, read=3.0, write=3.0, pool=2.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    return _notify_client
+
+
+async def _notify_worker(queue: asyncio.Queue[tuple[str, str, str, int]]) -> None:
+    while True:
+        order_id, category, city, client_id = await queue.get()
+        try:
+            await notify_new_order(order_id, category, city, client_id)
+        finally:
+            queue.task_done()
+
+
+def start_notification_workers(worker_count: int = _NOTIFY_WORKER_COUNT) -> None:
+    """Spawn the notification workers and HTTP client. Called from the app lifespan."""
+    global _notify_queue
+    _get_notify_client()
+    _notify_queue = asyncio.Queue(maxsize=_NOTIFY_QUEUE_SIZE)
+    for _ in range(worker_count):
+        _worker_tasks.append(asyncio.create_task(_notify_worker(_notify_queue)))
+
+
+async def stop_notification_workers() -> None:
+    """Cancel the workers and close the client. Called from the app lifespan."""
+    global _notify_client, _notify_queue
+    for task in _worker_tasks:
+        task.cancel()
+    for task in _worker_tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    _worker_tasks.clear()
+    _notify_queue = None
+    # Null out the client so the next lifespan cycle (or a lazy caller)
+    # recreates it instead of posting through a closed pool.
+    if _notify_client is not None:
+        await _notify_client.aclose()
+        _notify_client = None
+
+
+def enqueue_new_order(order_id: str, category: str, city: str, client_id: int) -> bool:
+    """
+    Enqueue a new-order notification. Returns False when the queue is not
+    running or full so the caller can fall back to BackgroundTasks.
+    """
+    if _notify_queue is None:
+        return False
+    try:
+        _notify_queue.put_nowait((order_id, category, city, client_id))
+    except asyncio.QueueFull:
+        logger.warning("Notification queue full, falling back for order %s", order_id)
+        return False
+    return True
+
 
 async def notify_new_order(order_id: str, category: str, city: str, client_id: int) -> None:
     """
@@ -29,32 +112,32 @@ async def _send_notifications(
 ) -> None:
     now = datetime.now(timezone.utc)
 
-    # Find subscribed executors matching category + city, excluding the client
+    # Find subscribed executors matching category + city, excluding the client.
+    # The frequency cooldown is applied in SQL so users mid-cooldown are never
+    # fetched at all.
+    # Only the chat id is needed to send — skip hydrating full User rows.
+    # (The request-frequency columns became unnecessary once the cooldown
+    # moved into the WHERE clause.)
     result = await db.execute(
-        select(User).where(
+        select(User.id).where(
             User.notifications_enabled.is_(True),
             User.subscribed_categories.contains([category]),
             User.subscribed_cities.contains([city]),
             User.id != client_id,
+            or_(
+                User.last_notified_at.is_(None),
+                User.last_notified_at
+                + func.make_interval(0, 0, 0, 0, 0, User.notification_frequency_minutes)
+                <= now,
+            ),
         )
     )
-    executors = list(result.scalars().all())
-
-    if not executors:
-        logger.info("No subscribed executors for order %s (cat=%s, city=%s)", order_id, category, city)
-        return
-
-    # Filter by notification frequency
-    eligible = []
-    for executor in executors:
-        if executor.last_notified_at is not None:
-            cooldown = executor.last_notified_at + timedelta(minutes=executor.notification_frequency_minutes)
-            if now < cooldown:
-                continue
-        eligible.append(executor)
+    eligible = list(result.scalars().all())
 
     if not eligible:
-        logger.info("All %d executors for order %s are in cooldown", len(executors), order_id)
+        logger.info(
+            "No eligible executors for order %s (cat=%s, city=%s)", order_id, category, city
+        )
         return
 
     bot_url = f"https://api.telegram.org/bot{settings.telegram_bot_token}/sendMessage"
@@ -64,22 +147,37 @@ async def _send_notifications(
     else:
         text = f"🔔 Новый заказ в категории «{category}» в городе {city}!\n\nОткройте приложение, чтобы посмотреть детали."
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        for executor in eligible:
+    # Fire the sends concurrently (bounded) — total latency becomes ~one
+    # Telegram round-trip instead of one per eligible executor.
+    semaphore = asyncio.Semaphore(_SEND_CONCURRENCY)
+    sent_ids: list[int] = []
+    client = _get_notify_client()
+
+    async def _send_one(executor_id: int) -> None:
+        async with semaphore:
             try:
                 resp = await client.post(bot_url, json={
-                    "chat_id": executor.id,
+                    "chat_id": executor_id,
                     "text": text,
                 })
-                if resp.status_code == 200:
-                    executor.last_notified_at = now
-                else:
-                    logger.warning(
-                        "Telegram API returned %d for user %d: %s",
-                        resp.status_code, executor.id, resp.text,
-                    )
             except Exception:
-                logger.exception("Failed to send notification to user %d", executor.id)
+                logger.exception("Failed to send notification to user %d", executor_id)
+                return
+            if resp.status_code == 200:
+                sent_ids.append(executor_id)
+            else:
+                logger.warning(
+                    "Telegram API returned %d for user %d: %s",
+                    resp.status_code, executor_id, resp.text,
+                )
+
+    await asyncio.gather(*(_send_one(executor_id) for executor_id in eligible))
 
-    await db.commit()
-    logger.info("Notified %d executors about order %s", len(eligible), order_id)
+    # One set-based UPDATE for everyone we reached, instead of flushing a
+    # separate UPDATE per dirty User object.
+    if sent_ids:
+        await db.execute(
+            update(User).where(User.id.in_(sent_ids)).values(last_notified_at=now)
+        )
+        await db.commit()
+    logger.info("Notified %d executors about order %s", len(sent_ids), order_id)
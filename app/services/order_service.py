@@ -1,19 +1,72 @@
 import secrets
+import time
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import Row, and_, bindparam, func, lambda_stmt, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, load_only, raiseload, selectinload
 
 from app.core.config import settings
 from app.models.balance import BalanceTransaction, TransactionType
 from app.models.order import ExecutorTake, Order, OrderStatus
+from app.models.review import ClientReview
 from app.models.user import User
 from app.schemas.order import CreateOrderRequest, UpdateOrderRequest
+from app.utils.clock import utcnow
 
 # Statuses visible in public listing
-LISTABLE_STATUSES = {OrderStatus.ACTIVE, OrderStatus.EXPIRED, OrderStatus.COMPLETED}
+LISTABLE_STATUSES = frozenset({OrderStatus.ACTIVE, OrderStatus.EXPIRED, OrderStatus.COMPLETED})
+
+# Columns the order response shapes actually serialize. Read-only paths load
+# only these and raise on anything else, so an accidental lazy load shows up
+# as an error instead of a hidden extra query.
+_ORDER_RESPONSE_COLUMNS = (
+    Order.id,
+    Order.client_id,
+    Order.category,
+    Order.description,
+    Order.city,
+    Order.contact,
+    Order.created_at,
+    Order.expires_in_minutes,
+    Order.status,
+    Order.customer_responded_at,
+    Order.city_locked,
+    Order.executor_count,
+)
+
+# Bumped on every order mutation (including the expiry sweeper); cached list
+# pages embed the generation in their key, so stale entries simply stop
+# being addressed instead of needing explicit eviction.
+_orders_generation = 0
+
+
+def orders_generation() -> int:
+    return _orders_generation
+
+
+def bump_orders_generation() -> None:
+    global _orders_generation
+    _orders_generation += 1
+
+
+def _order_by_id_stmt(with_client_filter: bool = False, with_reviews: bool = False):
+    # lambda_stmt caches the compiled SQL keyed on the lambda's code objects,
+    # so the identical order-by-id lookup issued by every mutation endpoint
+    # skips statement construction/compilation after the first call.
+    stmt = lambda_stmt(
+        lambda: select(Order)
+        .options(selectinload(Order.executor_takes))
+        .where(Order.id == bindparam("order_id"))
+    )
+    if with_client_filter:
+        stmt += lambda s: s.where(Order.client_id == bindparam("uid"))
+    if with_reviews:
+        stmt += lambda s: s.options(selectinload(Order.reviews))
+    return stmt
 
 
 class OrderService:
@@ -22,37 +75,27 @@ class OrderService:
         return secrets.token_urlsafe(12)[:12]
 
     @staticmethod
-    def is_expired(order: Order, now: datetime | None = None) -> bool:
-        if now is None:
-            now = datetime.now(timezone.utc)
-        expiry = order.created_at + timedelta(minutes=order.expires_in_minutes)
-        return now >= expiry
+    def is_expired(order: Order, now_ts: float | None = None) -> bool:
+        # Plain float comparison — no datetime/timedelta objects allocated.
+        # Callers checking many orders should pass time.time() once.
+        if now_ts is None:
+            now_ts = time.time()
+        return order.expires_at.timestamp() <= now_ts
 
     @staticmethod
-    def minutes_left(order: Order, now: datetime | None = None) -> int:
-        if now is None:
-            now = datetime.now(timezone.utc)
-        expiry = order.created_at + timedelta(minutes=order.expires_in_minutes)
-        remaining = (expiry - now).total_seconds() / 60
+    def minutes_left(order: Order, now_ts: float | None = None) -> int:
+        if now_ts is None:
+            now_ts = time.time()
+        remaining = (order.expires_at.timestamp() - now_ts) / 60
         return max(0, int(remaining))
 
     @staticmethod
     async def create_order(
         db: AsyncSession, user: User, request: CreateOrderRequest
     ) -> Order:
-        result = await db.execute(
-            select(Order).where(
-                Order.contact == request.contact,
-                Order.status == OrderStatus.ACTIVE,
-            )
-        )
-        existing = result.scalar_one_or_none()
-        if existing:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="This contact already has an active order",
-            )
-
+        # One clock read feeds both timestamps so expires_at is exactly
+        # created_at + lifetime.
+        now = utcnow()
         order = Order(
             id=OrderService.generate_order_id(),
             client_id=user.id,
@@ -62,6 +105,12 @@ class OrderService:
             contact=request.contact,
             city_locked=True,
             expires_in_minutes=settings.order_lifetime_minutes,
+            created_at=now,
+            expires_at=now + timedelta(minutes=settings.order_lifetime_minutes),
+            # A pending object's untouched collection stays unloaded through
+            # commit; initialize it so lazy="raise" doesn't fire when the
+            # route serializes the fresh order.
+            executor_takes=[],
         )
 
         db.add(order)
@@ -69,8 +118,19 @@ class OrderService:
         # Update counter
         user.active_orders_count += 1
 
-        await db.commit()
-        await db.refresh(order, ["executor_takes"])
+        # The ux_orders_active_contact partial unique index enforces "one
+        # active order per contact" — no pre-check SELECT, no race window.
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="This contact already has an active order",
+            )
+        bump_orders_generation()
+        # executor_takes was initialized to a loaded-empty list above and
+        # expire_on_commit=False keeps it, so no reload round-trip is needed.
         return order
 
     @staticmethod
@@ -78,9 +138,7 @@ class OrderService:
         db: AsyncSession, order_id: str, user: User, request: UpdateOrderRequest
     ) -> Order:
         result = await db.execute(
-            select(Order)
-            .options(selectinload(Order.executor_takes))
-            .where(Order.id == order_id, Order.client_id == user.id)
+            _order_by_id_stmt(with_client_filter=True), {"order_id": order_id, "uid": user.id}
         )
         order = result.scalar_one_or_none()
 
@@ -107,16 +165,16 @@ class OrderService:
         if request.contact:
             order.contact = request.contact
 
+        # expire_on_commit=False keeps the updated attributes live — the
+        # in-memory object already matches what was written.
         await db.commit()
-        await db.refresh(order)
+        bump_orders_generation()
         return order
 
     @staticmethod
     async def delete_order(db: AsyncSession, order_id: str, user: User) -> None:
         result = await db.execute(
-            select(Order)
-            .options(selectinload(Order.executor_takes))
-            .where(Order.id == order_id, Order.client_id == user.id)
+            _order_by_id_stmt(with_client_filter=True), {"order_id": order_id, "uid": user.id}
         )
         order = result.scalar_one_or_none()
 
@@ -137,6 +195,7 @@ class OrderService:
         user.active_orders_count = max(0, user.active_orders_count - 1)
 
         await db.commit()
+        bump_orders_generation()
 
     @staticmethod
     async def get_order(
@@ -145,7 +204,16 @@ class OrderService:
         """Returns (order, show_contact). Does NOT mutate the ORM object."""
         result = await db.execute(
             select(Order)
-            .options(selectinload(Order.executor_takes), selectinload(Order.reviews))
+            .options(
+                load_only(*_ORDER_RESPONSE_COLUMNS),
+                raiseload("*"),
+                selectinload(Order.executor_takes).load_only(
+                    ExecutorTake.executor_id, ExecutorTake.taken_at
+                ),
+                selectinload(Order.reviews).load_only(
+                    ClientReview.rating, ClientReview.comment
+                ),
+            )
             .where(Order.id == order_id)
         )
         order = result.scalar_one_or_none()
@@ -175,39 +243,63 @@ class OrderService:
         offset: int = 0,
         client_id: int | None = None,
         executor_id: int | None = None,
-    ) -> tuple[list[Order], int]:
-        """List orders. Does NOT mutate ORM objects — contact hiding is done in the route."""
+    ) -> tuple[list[Row[Any]], int, dict[str, tuple[int, str | None]]]:
+        """
+        List orders. Returns (rows, total, reviews): Core column rows (no ORM
+        entities, so no identity-map or instrumentation cost on this read-only
+        path), the total match count, and first-review (rating, comment) keyed
+        by order id. Take counts come from the denormalized executor_count
+        column — no join against executor_takes at all.
+        """
         # Restrict to public statuses (skip restriction when filtering by owner/executor)
         if not client_id and not executor_id and status_filter not in LISTABLE_STATUSES:
             status_filter = OrderStatus.ACTIVE
 
-        query = select(Order).options(
-            selectinload(Order.executor_takes),
-            selectinload(Order.reviews),
-        )
+        # count().over() runs after grouping, so every row carries the total
+        # match count — no separate COUNT(*) execution of the same filters.
+        query = select(*_ORDER_RESPONSE_COLUMNS, func.count().over().label("total"))
 
         if executor_id:
-            query = query.join(ExecutorTake).where(ExecutorTake.executor_id == executor_id)
+            # Separate alias: the filter join must not skew the take count
+            take_filter = aliased(ExecutorTake)
+            query = query.join(
+                take_filter,
+                (take_filter.order_id == Order.id) & (take_filter.executor_id == executor_id),
+            )
 
+        # Collect filters and apply them as one fused AND — a single .where()
+        # keeps the clause tree flat, which is cheaper to build and cache.
+        conds = []
         if client_id:
-            query = query.where(Order.client_id == client_id)
+            conds.append(Order.client_id == client_id)
         if status_filter:
-            query = query.where(Order.status == status_filter)
+            conds.append(Order.status == status_filter)
         if category:
-            query = query.where(Order.category == category)
+            conds.append(Order.category == category)
         if city:
-            query = query.where(Order.city == city)
-
-        query = query.order_by(Order.created_at.desc())
-
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query) or 0
+            conds.append(Order.city == city)
+        if conds:
+            query = query.where(and_(*conds))
 
-        query = query.limit(limit).offset(offset)
+        query = query.order_by(Order.created_at.desc()).limit(limit).offset(offset)
         result = await db.execute(query)
-        orders = list(result.scalars().all())
+        rows = list(result.all())
+
+        total = rows[0].total if rows else 0
+
+        # Reviews only exist on completed/expired orders, so the ACTIVE feed
+        # (the common case) never pays for this second query.
+        reviews: dict[str, tuple[int, str | None]] = {}
+        if rows and status_filter != OrderStatus.ACTIVE:
+            review_result = await db.execute(
+                select(ClientReview.order_id, ClientReview.rating, ClientReview.comment).where(
+                    ClientReview.order_id.in_([row.id for row in rows])
+                )
+            )
+            for order_id, rating, comment in review_result:
+                reviews.setdefault(order_id, (rating, comment))
 
-        return orders, total
+        return rows, total, reviews
 
     @staticmethod
     async def take_order(
@@ -218,25 +310,43 @@ class OrderService:
         Returns (contact, executor_count, new_balance).
         Locks both executor and order rows to prevent race conditions.
         """
-        # Lock executor row to prevent concurrent balance races
-        result = await db.execute(
-            select(User).where(User.id == executor.id).with_for_update()
-        )
-        executor = result.scalar_one()
-
-        # Lock order row
-        order_result = await db.execute(
-            select(Order)
-            .options(selectinload(Order.executor_takes))
-            .where(Order.id == order_id)
-            .with_for_update()
-        )
-        order: Order | None = order_result.scalar_one_or_none()
+        # Client retries/polling make repeat takes common. A cheap EXISTS
+        # probe answers those without acquiring the two row locks below; the
+        # locked path keeps its own dedup check as the race-safe backstop.
+        already = (
+            await db.execute(
+                select(Order.contact, Order.executor_count).where(
+                    Order.id == order_id,
+                    select(ExecutorTake.id)
+                    .where(
+                        ExecutorTake.order_id == order_id,
+                        ExecutorTake.executor_id == executor.id,
+                    )
+                    .exists(),
+                )
+            )
+        ).one_or_none()
+        if already is not None:
+            return already.contact, already.executor_count, executor.balance
+
+        # Lock the order and the executor's row in one statement (of= narrows
+        # the FOR UPDATE to exactly those two rows) — one round-trip instead
+        # of two separate locking selects.
+        row = (
+            await db.execute(
+                select(Order, User)
+                .join(User, User.id == executor.id)
+                .options(selectinload(Order.executor_takes))
+                .where(Order.id == order_id)
+                .with_for_update(of=[Order, User])
+            )
+        ).one_or_none()
 
-        if not order:
+        if row is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
             )
+        order, executor = row.Order, row.User
 
         if order.status != OrderStatus.ACTIVE:
             raise HTTPException(
@@ -253,6 +363,7 @@ class OrderService:
             if client:
                 client.active_orders_count = max(0, client.active_orders_count - 1)
             await db.commit()
+            bump_orders_generation()
             raise HTTPException(
                 status_code=status.HTTP_410_GONE, detail="Order has expired"
             )
@@ -266,10 +377,10 @@ class OrderService:
 
         # Already taken by this executor — return contact without charging
         if any(take.executor_id == executor.id for take in order.executor_takes):
-            return order.contact, len(order.executor_takes), executor.balance
+            return order.contact, order.executor_count, executor.balance
 
-        # Max executors check
-        if len(order.executor_takes) >= settings.max_executors_per_order:
+        # Max executors check (on the denormalized count — row is locked)
+        if order.executor_count >= settings.max_executors_per_order:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Maximum {settings.max_executors_per_order} executors reached",
@@ -286,9 +397,11 @@ class OrderService:
         executor.balance -= settings.order_take_cost
         executor.active_orders_count += 1
 
-        # Create executor take
+        # Create executor take; appending to the loaded collection cascades
+        # the insert and keeps the in-memory state current without a reload.
         take = ExecutorTake(order_id=order.id, executor_id=executor.id)
-        db.add(take)
+        order.executor_takes.append(take)
+        order.executor_count += 1
 
         # Log transaction
         transaction = BalanceTransaction(
@@ -302,20 +415,16 @@ class OrderService:
         db.add(transaction)
 
         await db.commit()
-        await db.refresh(order, ["executor_takes"])
+        bump_orders_generation()
 
-        return order.contact, len(order.executor_takes), executor.balance
+        return order.contact, order.executor_count, executor.balance
 
     @staticmethod
     async def respond_to_order(
         db: AsyncSession, order_id: str, user: User
     ) -> Order:
         """Client confirms they responded to executor contact."""
-        result = await db.execute(
-            select(Order)
-            .options(selectinload(Order.executor_takes))
-            .where(Order.id == order_id)
-        )
+        result = await db.execute(_order_by_id_stmt(), {"order_id": order_id})
         order = result.scalar_one_or_none()
 
         if not order:
@@ -347,8 +456,9 @@ class OrderService:
             )
 
         order.customer_responded_at = datetime.now(timezone.utc)
+        # Takes were eager-loaded above and nothing changed them — no reload.
         await db.commit()
-        await db.refresh(order, ["executor_takes"])
+        bump_orders_generation()
         return order
 
     @staticmethod
@@ -356,11 +466,7 @@ class OrderService:
         db: AsyncSession, order_id: str, user: User
     ) -> None:
         """Client closes order without completion (e.g. no longer needed)."""
-        result = await db.execute(
-            select(Order)
-            .options(selectinload(Order.executor_takes))
-            .where(Order.id == order_id)
-        )
+        result = await db.execute(_order_by_id_stmt(), {"order_id": order_id})
         order = result.scalar_one_or_none()
 
         if not order:
@@ -388,26 +494,26 @@ class OrderService:
         order.status = OrderStatus.CLOSED_NO_RESPONSE
         user.active_orders_count = max(0, user.active_orders_count - 1)
 
-        # Decrement executor counters
-        for take in order.executor_takes:
-            executor_result = await db.execute(
-                select(User).where(User.id == take.executor_id)
-            )
-            executor = executor_result.scalar_one_or_none()
-            if executor:
-                executor.active_orders_count = max(0, executor.active_orders_count - 1)
+        # Decrement executor counters (one IN query instead of one per take)
+        executor_ids = {take.executor_id for take in order.executor_takes}
+        executors = (
+            await db.execute(select(User).where(User.id.in_(executor_ids)))
+        ).scalars()
+        for executor in executors:
+            executor.active_orders_count = max(0, executor.active_orders_count - 1)
 
         await db.commit()
+        bump_orders_generation()
 
     @staticmethod
     async def complete_order(
         db: AsyncSession, order_id: str, user: User
     ) -> Order:
         """Client marks order as completed."""
+        # Reviews are eager-loaded up front so the response can be serialized
+        # straight after commit without a refresh round-trip.
         result = await db.execute(
-            select(Order)
-            .options(selectinload(Order.executor_takes))
-            .where(Order.id == order_id)
+            _order_by_id_stmt(with_reviews=True), {"order_id": order_id}
         )
         order = result.scalar_one_or_none()
 
@@ -437,16 +543,15 @@ class OrderService:
         user.active_orders_count = max(0, user.active_orders_count - 1)
         user.completed_orders_count += 1
 
-        # Update executor counters
-        for take in order.executor_takes:
-            executor_result = await db.execute(
-                select(User).where(User.id == take.executor_id)
-            )
-            executor = executor_result.scalar_one_or_none()
-            if executor:
-                executor.active_orders_count = max(0, executor.active_orders_count - 1)
-                executor.completed_orders_count += 1
+        # Update executor counters (one IN query instead of one per take)
+        executor_ids = {take.executor_id for take in order.executor_takes}
+        executors = (
+            await db.execute(select(User).where(User.id.in_(executor_ids)))
+        ).scalars()
+        for executor in executors:
+            executor.active_orders_count = max(0, executor.active_orders_count - 1)
+            executor.completed_orders_count += 1
 
         await db.commit()
-        await db.refresh(order, ["executor_takes", "reviews"])
+        bump_orders_generation()
         return order
@@ -1,7 +1,8 @@
+from typing import Any
+
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import Row, and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.models.order import ExecutorTake, Order, OrderStatus
 from app.models.review import ClientReview, ExecutorComplaint
@@ -15,58 +16,55 @@ class ReviewService:
         db: AsyncSession, user: User, request: ClientReviewRequest
     ) -> int:
         """Client leaves review for executor"""
-        result = await db.execute(
-            select(Order)
-            .options(selectinload(Order.executor_takes))
-            .where(Order.id == request.order_id, Order.client_id == user.id)
-        )
-        order = result.scalar_one_or_none()
+        # All three validation reads (order ownership/status, executor take,
+        # duplicate review) collapse into one outer-joined query; the branches
+        # below inspect the returned columns instead of issuing more selects.
+        take_join = ExecutorTake.order_id == Order.id
+        if request.executor_id is not None:
+            take_join = and_(take_join, ExecutorTake.executor_id == request.executor_id)
+
+        row = (
+            await db.execute(
+                select(Order.status, ExecutorTake.executor_id, ClientReview.id)
+                .select_from(Order)
+                .outerjoin(ExecutorTake, take_join)
+                .outerjoin(
+                    ClientReview,
+                    and_(
+                        ClientReview.order_id == Order.id,
+                        ClientReview.client_id == user.id,
+                        ClientReview.executor_id == ExecutorTake.executor_id,
+                    ),
+                )
+                .where(Order.id == request.order_id, Order.client_id == user.id)
+                .order_by(ExecutorTake.taken_at)
+                .limit(1)
+            )
+        ).one_or_none()
 
-        if not order:
+        if row is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Order not found or you are not the client",
             )
 
-        if order.status not in [OrderStatus.COMPLETED, OrderStatus.EXPIRED]:
+        order_status, executor_id, existing_review_id = row
+
+        if order_status not in [OrderStatus.COMPLETED, OrderStatus.EXPIRED]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Can only review completed or expired orders",
             )
 
-        # Auto-resolve executor_id from order takes if not provided
-        executor_id = request.executor_id
         if executor_id is None:
-            if not order.executor_takes:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="No executor has taken this order",
-                )
-            executor_id = order.executor_takes[0].executor_id
-
-        # Verify the target executor actually took this order
-        result = await db.execute(
-            select(ExecutorTake).where(
-                ExecutorTake.order_id == request.order_id,
-                ExecutorTake.executor_id == executor_id,
-            )
-        )
-        take = result.scalar_one_or_none()
-        if not take:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="This executor did not take this order",
+                detail="This executor did not take this order"
+                if request.executor_id is not None
+                else "No executor has taken this order",
             )
 
-        # Check if already reviewed this executor for this order
-        result = await db.execute(
-            select(ClientReview).where(
-                ClientReview.order_id == request.order_id,
-                ClientReview.client_id == user.id,
-                ClientReview.executor_id == executor_id,
-            )
-        )
-        if result.scalar_one_or_none():
+        if existing_review_id is not None:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Already reviewed this executor for this order",
@@ -80,11 +78,11 @@ class ReviewService:
             comment=request.comment,
         )
         db.add(review)
-        await db.commit()
-        await db.refresh(review)
+        await db.flush()
 
-        # Update executor's average rating
+        # Update executor's average rating in the same transaction
         await ReviewService._update_executor_rating(db, executor_id)
+        await db.commit()
 
         return review.id
 
@@ -139,21 +137,19 @@ class ReviewService:
 
     @staticmethod
     async def _update_executor_rating(db: AsyncSession, executor_id: int) -> None:
-        """Recalculate executor's average rating"""
-        from sqlalchemy import func
-
-        result = await db.execute(
-            select(func.avg(ClientReview.rating)).where(
-                ClientReview.executor_id == executor_id
-            )
+        """
+        Recalculate executor's average rating with one UPDATE carrying the AVG
+        as a scalar subquery — no user row is fetched and the recompute is
+        atomic against concurrent reviews. Commit is left to the caller.
+        """
+        avg_subq = (
+            select(func.coalesce(func.avg(ClientReview.rating), 0.0))
+            .where(ClientReview.executor_id == executor_id)
+            .scalar_subquery()
+        )
+        await db.execute(
+            update(User).where(User.id == executor_id).values(average_rating=avg_subq)
         )
-        avg_rating = result.scalar() or 0.0
-
-        result = await db.execute(select(User).where(User.id == executor_id))
-        executor = result.scalar_one_or_none()
-        if executor:
-            executor.average_rating = float(avg_rating)
-            await db.commit()
 
     @staticmethod
     async def list_reviews(
@@ -162,15 +158,27 @@ class ReviewService:
         limit: int = 50,
         client_id: int | None = None,
         executor_id: int | None = None,
-    ) -> list[ClientReview]:
-        """List reviews with optional rating/author/subject filter"""
+    ) -> list[Row[Any]]:
+        """
+        List reviews with optional rating/author/subject filter.
+        Returns flat rows (review + order + author columns) from a single
+        joined query — no ORM graph materialization for read-only listing.
+        """
         query = (
-            select(ClientReview)
-            .options(
-                selectinload(ClientReview.order),
-                selectinload(ClientReview.executor),
-                selectinload(ClientReview.client),
+            select(
+                ClientReview.id,
+                ClientReview.rating,
+                ClientReview.comment,
+                ClientReview.created_at,
+                ClientReview.order_id,
+                User.first_name.label("author_name"),
+                Order.category,
+                Order.description,
+                Order.contact,
+                Order.city,
             )
+            .join(User, User.id == ClientReview.executor_id, isouter=True)
+            .join(Order, Order.id == ClientReview.order_id, isouter=True)
             .order_by(ClientReview.created_at.desc())
         )
 
@@ -183,7 +191,7 @@ class ReviewService:
 
         query = query.limit(limit)
         result = await db.execute(query)
-        return list(result.scalars().all())
+        return list(result.all())
 
     @staticmethod
     async def check_review_exists(
@@ -0,0 +1,12 @@
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+# Set once per request by middleware so every default/onupdate evaluated in
+# that request's unit of work shares one clock read — all timestamps in a
+# flush align, and repeated clock_gettime syscalls are avoided.
+request_now_var: ContextVar[datetime | None] = ContextVar("request_now", default=None)
+
+
+def utcnow() -> datetime:
+    """Current UTC time, frozen per request when middleware has set it."""
+    return request_now_var.get() or datetime.now(timezone.utc)
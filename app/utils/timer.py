@@ -1,95 +1,205 @@
+import asyncio
 import logging
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
-from app.models.order import Order, OrderStatus
+from app.core.database import async_session_maker
+from app.models.balance import TransactionType
+from app.models.order import ExecutorTake, Order, OrderStatus
 from app.models.user import User
 from app.services.balance_service import BalanceService
+from app.services.order_service import bump_orders_generation
 
 logger = logging.getLogger(__name__)
 
+# Set by create_order so the timer loop re-evaluates its sleep horizon
+# immediately instead of waiting out the current interval.
+timer_wakeup = asyncio.Event()
 
-async def auto_close_expired_orders(db: AsyncSession) -> int:
+
+def wake_timer() -> None:
+    timer_wakeup.set()
+
+
+async def next_order_deadline(db: AsyncSession) -> datetime | None:
+    """Earliest moment any active order can expire or hit its no-response deadline."""
+    next_expiry = await db.scalar(
+        select(func.min(Order.expires_at)).where(Order.status == OrderStatus.ACTIVE)
+    )
+
+    first_unanswered_take = await db.scalar(
+        select(func.min(ExecutorTake.taken_at))
+        .join(Order, ExecutorTake.order_id == Order.id)
+        .where(Order.status == OrderStatus.ACTIVE, Order.customer_responded_at.is_(None))
+    )
+    no_response_deadline = (
+        first_unanswered_take + timedelta(minutes=settings.no_response_close_minutes)
+        if first_unanswered_take is not None
+        else None
+    )
+
+    candidates = [d for d in (next_expiry, no_response_deadline) if d is not None]
+    return min(candidates) if candidates else None
+
+
+# Orders processed (and committed) per sweep partition — bounds peak memory
+# when a large backlog expires at once.
+_SWEEP_BATCH_SIZE = 500
+
+
+async def _close_batch(db: AsyncSession, orders: list[Order], new_status: OrderStatus) -> int:
     """
-    Background task: Close orders that expired or got no customer response.
-    Returns count of closed orders.
+    Close one partition of orders: bulk status flip, set-based counter
+    decrements and (for no-response closes) refunds. Commits before
+    returning so each partition is durable on its own.
     """
-    now = datetime.now(timezone.utc)
-    closed_count = 0
+    if not orders:
+        return 0
 
-    result = await db.execute(
-        select(Order)
-        .options(selectinload(Order.executor_takes))
-        .where(Order.status == OrderStatus.ACTIVE)
+    await db.execute(
+        update(Order)
+        .where(Order.id.in_([order.id for order in orders]))
+        .values(status=new_status)
     )
-    orders = result.scalars().all()
 
+    # A user may be involved in several closing orders; group by decrement so
+    # each distinct amount is one UPDATE (almost always a single statement).
+    decrements: Counter[int] = Counter()
     for order in orders:
-        expiry = order.created_at + timedelta(minutes=order.expires_in_minutes)
+        decrements[order.client_id] += 1
+        for take in order.executor_takes:
+            decrements[take.executor_id] += 1
+
+    by_amount: dict[int, list[int]] = defaultdict(list)
+    for user_id, amount in decrements.items():
+        by_amount[amount].append(user_id)
+    for amount, ids in by_amount.items():
+        await db.execute(
+            update(User)
+            .where(User.id.in_(ids))
+            .values(active_orders_count=func.greatest(User.active_orders_count - amount, 0))
+        )
+
+    refund_rows: list[dict[str, object]] = []
+    if new_status is OrderStatus.CLOSED_NO_RESPONSE:
+        # Credit refunds with set-based UPDATE ... RETURNING (no User objects
+        # fetched), then derive per-order balance_after from the totals.
+        cost = settings.order_take_cost
+        refund_orders: dict[int, list[str]] = defaultdict(list)
+        for order in orders:
+            for take in order.executor_takes:
+                refund_orders[take.executor_id].append(order.id)
+
+        by_total: dict[int, list[int]] = defaultdict(list)
+        for user_id, order_ids in refund_orders.items():
+            by_total[cost * len(order_ids)].append(user_id)
+
+        new_balances: dict[int, int] = {}
+        for total, ids in by_total.items():
+            result = await db.execute(
+                update(User)
+                .where(User.id.in_(ids))
+                .values(balance=User.balance + total)
+                .returning(User.id, User.balance)
+            )
+            new_balances.update(dict(result.all()))
+
+        for user_id, order_ids in refund_orders.items():
+            if user_id not in new_balances:
+                continue
+            balance = new_balances[user_id]
+            # Walk refunds backwards so each row records the running balance
+            for i, order_id in enumerate(order_ids):
+                refund_rows.append(
+                    {
+                        "user_id": user_id,
+                        "type": TransactionType.REFUND,
+                        "amount": cost,
+                        "balance_after": balance - cost * (len(order_ids) - 1 - i),
+                        "order_id": order_id,
+                        "description": f"Refund for order {order_id}",
+                    }
+                )
 
-        if now >= expiry:
-            order.status = OrderStatus.EXPIRED
-            closed_count += 1
+    await BalanceService.bulk_create_transactions(db, refund_rows)
+    await db.commit()
+    if refund_rows:
+        logger.info(
+            "Refunded %d₽ each to %d executors", settings.order_take_cost, len(refund_rows)
+        )
+    return len(orders)
 
-            # Update client counter
-            client_result = await db.execute(
-                select(User).where(User.id == order.client_id)
-            )
-            client = client_result.scalar_one_or_none()
-            if client:
-                client.active_orders_count = max(0, client.active_orders_count - 1)
 
-            # Update executor counters
-            for take in order.executor_takes:
-                executor_result = await db.execute(
-                    select(User).where(User.id == take.executor_id)
-                )
-                executor = executor_result.scalar_one_or_none()
-                if executor:
-                    executor.active_orders_count = max(0, executor.active_orders_count - 1)
-
-        elif order.executor_takes and not order.customer_responded_at:
-            first_take_time = min(take.taken_at for take in order.executor_takes)
-            no_response_deadline = first_take_time + timedelta(
-                minutes=settings.no_response_close_minutes
-            )
+async def _sweep_phase(stmt, new_status: OrderStatus) -> int:
+    """
+    Run one sweep phase on its own sessions: candidates are streamed on a
+    read session so peak memory stays O(partition), and each partition
+    commits on a separate write session without disturbing the read cursor.
+    """
+    closed = 0
+    async with async_session_maker() as read_db, async_session_maker() as write_db:
+        result = await read_db.stream_scalars(stmt)
+        async for batch in result.partitions(_SWEEP_BATCH_SIZE):
+            closed += await _close_batch(write_db, list(batch), new_status)
+    return closed
 
-            if now >= no_response_deadline:
-                order.status = OrderStatus.CLOSED_NO_RESPONSE
-                closed_count += 1
 
-                # Update client counter
-                client_result = await db.execute(
-                    select(User).where(User.id == order.client_id)
-                )
-                client = client_result.scalar_one_or_none()
-                if client:
-                    client.active_orders_count = max(0, client.active_orders_count - 1)
-
-                # Refund executors who paid and update counters
-                for take in order.executor_takes:
-                    executor_result = await db.execute(
-                        select(User).where(User.id == take.executor_id)
-                    )
-                    executor = executor_result.scalar_one_or_none()
-                    if executor:
-                        executor.active_orders_count = max(0, executor.active_orders_count - 1)
-                        await BalanceService.refund_order(
-                            db, executor, order.id, settings.order_take_cost
-                        )
-                        logger.info(
-                            "Refunded %d₽ to user %d for order %s",
-                            settings.order_take_cost,
-                            executor.id,
-                            order.id,
-                        )
+async def auto_close_expired_orders() -> int:
+    """
+    Background task: Close orders that expired or got no customer response.
+    Returns count of closed orders.
+    """
+    now = datetime.now(timezone.utc)
+
+    # Filter in SQL so only orders that actually need closing are transferred
+    # and materialized — not every active order in the table. expires_at is
+    # stored at creation, so the predicate is index-friendly (no per-row
+    # interval arithmetic).
+    expired_stmt = (
+        select(Order)
+        .options(selectinload(Order.executor_takes))
+        .where(Order.status == OrderStatus.ACTIVE, Order.expires_at <= now)
+        .execution_options(yield_per=_SWEEP_BATCH_SIZE)
+    )
+
+    # Unanswered orders whose first take is past the no-response deadline
+    # (hard-expired ones above take precedence, hence expires_at > now).
+    cutoff = now - timedelta(minutes=settings.no_response_close_minutes)
+    no_response_ids = (
+        select(ExecutorTake.order_id)
+        .join(Order, ExecutorTake.order_id == Order.id)
+        .where(
+            Order.status == OrderStatus.ACTIVE,
+            Order.customer_responded_at.is_(None),
+            Order.expires_at > now,
+        )
+        .group_by(ExecutorTake.order_id)
+        .having(func.min(ExecutorTake.taken_at) <= cutoff)
+    )
+    no_response_stmt = (
+        select(Order)
+        .options(selectinload(Order.executor_takes))
+        .where(Order.id.in_(no_response_ids))
+        .execution_options(yield_per=_SWEEP_BATCH_SIZE)
+    )
+
+    # The two phases touch disjoint order sets (expires_at splits them), so
+    # they run concurrently on independent sessions — the round-trip latency
+    # of one phase overlaps the other's.
+    closed_count = sum(
+        await asyncio.gather(
+            _sweep_phase(expired_stmt, OrderStatus.EXPIRED),
+            _sweep_phase(no_response_stmt, OrderStatus.CLOSED_NO_RESPONSE),
+        )
+    )
 
     if closed_count > 0:
-        await db.commit()
+        bump_orders_generation()
         logger.info("Auto-closed %d expired orders", closed_count)
 
     return closed_count
@@ -0,0 +1,33 @@
+import time
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    Minimal in-process cache with per-entry expiry and bounded size.
+    Eviction is insertion-ordered (oldest first) — good enough for the
+    short TTLs used on hot request paths, without an external dependency.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: dict[Hashable, tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._data.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if key not in self._data and len(self._data) >= self._maxsize:
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + self._ttl, value)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -0,0 +1,6 @@
+import os
+
+# Settings are loaded at import time; provide the required values before any
+# app module is imported.
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test-token")
+os.environ.setdefault("SECRET_KEY", "test-secret")
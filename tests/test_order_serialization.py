@@ -0,0 +1,66 @@
+"""Regression test for POST /orders response serialization.
+
+The create path is the only one with no query-level eager load of
+Order.executor_takes (lazy="raise"): a pending object's untouched collection
+stays unloaded through commit, so create_order must initialize it or the
+route's serialization raises on every creation.
+"""
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+from app.api.orders import _order_to_dict
+from app.core.database import Base
+from app.models.order import Order
+from app.utils.clock import utcnow
+
+
+def _fresh_order(**kwargs) -> Order:
+    now = utcnow()
+    return Order(
+        id="abc123def456",
+        client_id=1,
+        category="Клининг",
+        description="Нужна уборка после ремонта",
+        city="Москва",
+        contact="@someone",
+        city_locked=True,
+        expires_in_minutes=60,
+        created_at=now,
+        expires_at=now + timedelta(minutes=60),
+        **kwargs,
+    )
+
+
+def _commit(order: Order) -> None:
+    engine = create_engine("sqlite://")
+    # Only the orders table: other models use Postgres-only types (ARRAY) and
+    # sqlite does not enforce the dangling FK anyway.
+    Base.metadata.create_all(engine, tables=[Order.__table__])
+    with Session(engine, expire_on_commit=False) as session:
+        session.add(order)
+        session.commit()
+
+
+def test_fresh_order_serializes_like_create_order():
+    # Mirrors create_order: the collection is initialized before commit, so
+    # serializing the response does not touch the lazy="raise" relationship.
+    order = _fresh_order(executor_takes=[])
+    _commit(order)
+
+    content = _order_to_dict(order, skip_reviews=True)
+    assert content["taken_by"] == []
+    assert content["executor_count"] == 0
+
+
+def test_uninitialized_takes_raise_after_commit():
+    # The trap the create path must avoid: without initialization the
+    # collection is unloaded after commit and lazy="raise" fires.
+    order = _fresh_order()
+    _commit(order)
+
+    with pytest.raises(InvalidRequestError):
+        _order_to_dict(order, skip_reviews=True)